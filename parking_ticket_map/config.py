@@ -18,12 +18,22 @@ DERIVED_DATA_DIR: Path = Path("data/derived")
 # Directory for raw API responses (newline-delimited JSON snapshots)
 RAW_DATA_DIR: Path = Path("data/raw")
 
+# Number of raw ticket rows pulled from SQLite per chunk during aggregation
+AGGREGATION_CHUNK_SIZE: int = 500_000
+
 # Timeout (seconds) for HTTP requests to the Socrata endpoint
 HTTP_TIMEOUT: int = 60
 
-# Default sleep duration between API requests (seconds)
+# Default sleep duration between API request windows (seconds)
 DEFAULT_SLEEP_SECONDS: float = 0.25
 
+# Maximum number of shard paginators fetching the API concurrently
+MAX_CONCURRENT_REQUESTS: int = 4
+
+# Borough codes used to shard ingestion into independent paginators. Records
+# with any other (or missing) county fall into a catch-all remainder shard.
+INGESTION_SHARD_BOROUGHS: tuple[str, ...] = ("NY", "K", "Q", "BX", "R")
+
 # Accepted ticket types that qualify as parking violations.
 # Camera violations are filtered out by excluding known camera-related types.
 PARKING_TICKET_TYPES = {
@@ -41,6 +51,12 @@ CAMERA_TICKET_TYPES = {
     "SCHOOL ZONE SPEED CAMERA",
 }
 
+# SoQL clause excluding camera violations, built once at import time. Sorted so
+# the generated query string (and thus the request URL) is stable across runs.
+CAMERA_FILTER_CLAUSE: str = " AND ".join(
+    f"upper(ticket_type) NOT LIKE '{value.upper()}%'" for value in sorted(CAMERA_TICKET_TYPES)
+)
+
 # Fields that are extracted from the API responses and persisted to the database.
 # The API field names match the database column names 1:1.
 RAW_FIELDS: tuple[str, ...] = (
@@ -1,14 +1,18 @@
 """Utilities to ingest parking ticket data from the NYC Open Data API."""
 from __future__ import annotations
 
-import json
 import logging
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Dict, Iterator, List, Optional
 
+import orjson
 import requests
+from urllib3.util.retry import Retry
 
 from . import config
 from .storage import TicketDatabase
@@ -34,6 +38,14 @@ class IngestionStats:
         }
 
 
+def _shard_clauses() -> List[str]:
+    """SoQL clauses splitting the dataset into disjoint per-borough shards."""
+    codes = ", ".join(f"'{code}'" for code in config.INGESTION_SHARD_BOROUGHS)
+    clauses = [f"violation_county = '{code}'" for code in config.INGESTION_SHARD_BOROUGHS]
+    clauses.append(f"(violation_county NOT IN ({codes}) OR violation_county IS NULL)")
+    return clauses
+
+
 class ParkingTicketIngestor:
     """Fetches parking ticket data and writes it to the local database."""
 
@@ -45,9 +57,28 @@ class ParkingTicketIngestor:
         session: Optional[requests.Session] = None,
     ) -> None:
         self.db = db
-        self.session = session or requests.Session()
+        self.session = session or self._build_session()
         self.app_token = app_token
 
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """Build a session tuned for many small keep-alive requests to one host."""
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+            ),
+        )
+        session.mount("https://", adapter)
+        # Only advertise encodings urllib3 can decode without extras installed.
+        session.headers["Accept-Encoding"] = "gzip"
+        return session
+
     def _build_headers(self) -> Dict[str, str]:
         headers: Dict[str, str] = {}
         if self.app_token:
@@ -58,27 +89,29 @@ class ParkingTicketIngestor:
         self,
         *,
         limit: int,
-        offset: int,
+        after_summons: Optional[str] = None,
         issue_date_from: Optional[str] = None,
         issue_date_to: Optional[str] = None,
         ticket_type_filter: bool = True,
+        extra_where: Optional[str] = None,
     ) -> List[dict]:
         params: Dict[str, str] = {
             "$limit": str(limit),
-            "$offset": str(offset),
+            "$order": "summons_number",
         }
 
         where_clauses: List[str] = []
+        if after_summons:
+            where_clauses.append(f"summons_number > '{after_summons}'")
         if issue_date_from:
             where_clauses.append(f"issue_date >= '{issue_date_from}'")
         if issue_date_to:
             where_clauses.append(f"issue_date <= '{issue_date_to}'")
+        if extra_where:
+            where_clauses.append(extra_where)
 
         if ticket_type_filter:
-            camera_filters = " AND ".join(
-                [f"upper(ticket_type) NOT LIKE '{value.upper()}%'" for value in config.CAMERA_TICKET_TYPES]
-            )
-            where_clauses.append(f"({camera_filters} OR ticket_type IS NULL)")
+            where_clauses.append(f"({config.CAMERA_FILTER_CLAUSE} OR ticket_type IS NULL)")
 
         if where_clauses:
             params["$where"] = " AND ".join(where_clauses)
@@ -102,21 +135,112 @@ class ParkingTicketIngestor:
         issue_date_from: Optional[str] = None,
         issue_date_to: Optional[str] = None,
         sleep_seconds: float = config.DEFAULT_SLEEP_SECONDS,
+        after_summons: Optional[str] = None,
+        extra_where: Optional[str] = None,
     ) -> Iterator[List[dict]]:
-        offset = 0
-        while True:
-            page = self.fetch_page(
+        """Yield pages via keyset pagination on ``summons_number``.
+
+        Each page requests rows strictly after the previous page's last
+        summons number, ordered by summons number, so deep pages cost the
+        server the same as shallow ones (unlike ``$offset`` skips). The cursor
+        forces pages to arrive in order, but the next fetch is submitted to a
+        background worker before the current page is yielded, so the network
+        wait overlaps downstream processing. Passing ``after_summons`` resumes
+        a previous run from its last persisted cursor.
+        """
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(
+                self.fetch_page,
                 limit=page_size,
-                offset=offset,
+                after_summons=after_summons,
                 issue_date_from=issue_date_from,
                 issue_date_to=issue_date_to,
+                extra_where=extra_where,
             )
-            if not page:
-                break
-            yield page
-            offset += page_size
-            if sleep_seconds:
-                time.sleep(sleep_seconds)
+            while True:
+                page = future.result()
+                if not page:
+                    break
+                # Pages come back ordered by summons_number, so the last record
+                # carries the cursor for the next page.
+                future = pool.submit(
+                    self.fetch_page,
+                    limit=page_size,
+                    after_summons=page[-1]["summons_number"],
+                    issue_date_from=issue_date_from,
+                    issue_date_to=issue_date_to,
+                    extra_where=extra_where,
+                )
+                yield page
+                if sleep_seconds:
+                    time.sleep(sleep_seconds)
+
+    def fetch_sharded(
+        self,
+        *,
+        page_size: int = config.DEFAULT_PAGE_SIZE,
+        issue_date_from: Optional[str] = None,
+        issue_date_to: Optional[str] = None,
+        sleep_seconds: float = config.DEFAULT_SLEEP_SECONDS,
+    ) -> Iterator[List[dict]]:
+        """Merge pages from per-borough keyset paginators running in parallel.
+
+        Each borough shard (plus a remainder shard for unknown counties) runs
+        its own cursor in a worker thread and pushes pages onto a bounded
+        queue; pages are yielded in arrival order. The shards are disjoint, so
+        the union of their pages covers exactly the unsharded result set.
+        """
+        clauses = _shard_clauses()
+        pages: queue.Queue = queue.Queue(maxsize=2 * len(clauses))
+        done = object()
+        stop = threading.Event()
+
+        def offer(page: List[dict]) -> bool:
+            """Put a page unless the consumer has stopped; False means stop."""
+            while not stop.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run_shard(clause: str) -> None:
+            try:
+                for page in self.fetch_all(
+                    page_size=page_size,
+                    issue_date_from=issue_date_from,
+                    issue_date_to=issue_date_to,
+                    sleep_seconds=sleep_seconds,
+                    extra_where=clause,
+                ):
+                    if not offer(page):
+                        return
+            finally:
+                pages.put(done)
+
+        max_workers = min(len(clauses), config.MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(run_shard, clause) for clause in clauses]
+            remaining = len(clauses)
+            try:
+                while remaining:
+                    item = pages.get()
+                    if item is done:
+                        remaining -= 1
+                        continue
+                    yield item
+            finally:
+                # If the consumer stops early (generator closed, or ingest
+                # bails on a writer error), tell the shards to quit and keep
+                # draining so none of them stays blocked on the full queue;
+                # otherwise the executor shutdown would wait forever.
+                stop.set()
+                while remaining:
+                    if pages.get() is done:
+                        remaining -= 1
+                for future in futures:
+                    future.result()
 
     def ingest(
         self,
@@ -127,11 +251,37 @@ class ParkingTicketIngestor:
         dry_run: bool = False,
         snapshot_path: Optional[str] = None,
         sleep_seconds: float = config.DEFAULT_SLEEP_SECONDS,
+        shard_by_borough: bool = True,
     ) -> IngestionStats:
         stats = IngestionStats()
-        snapshot_handle = open(snapshot_path, "w", encoding="utf-8") if snapshot_path else None
+        fetch = self.fetch_sharded if shard_by_borough else self.fetch_all
+
+        # Database writes run on their own thread so a page insert does not
+        # stall the next network fetch (and vice versa). The bounded queue
+        # keeps at most a couple of pages in flight.
+        write_queue: queue.Queue = queue.Queue(maxsize=2)
+        writer_error: List[BaseException] = []
+
+        def writer_loop() -> None:
+            while True:
+                page = write_queue.get()
+                if page is None:
+                    return
+                if writer_error:
+                    continue  # keep draining so the producer never blocks
+                try:
+                    stats.records_inserted += self.db.upsert_records(page)
+                except BaseException as exc:  # surfaced to the caller after join
+                    writer_error.append(exc)
+
+        writer: Optional[threading.Thread] = None
+        if not dry_run:
+            writer = threading.Thread(target=writer_loop, name="ticket-db-writer", daemon=True)
+            writer.start()
+
+        snapshot_handle = open(snapshot_path, "wb") if snapshot_path else None
         try:
-            for page in self.fetch_all(
+            for page in fetch(
                 page_size=page_size,
                 issue_date_from=issue_date_from,
                 issue_date_to=issue_date_to,
@@ -142,19 +292,24 @@ class ParkingTicketIngestor:
                 logger.info("Fetched %s records (page %s)", len(page), stats.pages_fetched)
 
                 if snapshot_handle:
-                    for record in page:
-                        snapshot_handle.write(json.dumps(record))
-                        snapshot_handle.write("\n")
+                    snapshot_handle.writelines(orjson.dumps(record) + b"\n" for record in page)
 
                 if dry_run:
                     continue
 
-                inserted = self.db.upsert_records(page)
-                stats.records_inserted += inserted
+                if writer_error:
+                    break
+                write_queue.put(page)
         finally:
+            if writer is not None:
+                write_queue.put(None)
+                writer.join()
             if snapshot_handle:
                 snapshot_handle.close()
 
+        if writer_error:
+            raise writer_error[0]
+
         logger.info("Ingestion completed: %s", stats.as_dict())
         return stats
 
@@ -169,18 +324,20 @@ def run_ingestion(
     dry_run: bool = False,
     snapshot_path: Optional[str] = None,
     sleep_seconds: float = config.DEFAULT_SLEEP_SECONDS,
+    shard_by_borough: bool = True,
 ) -> IngestionStats:
-    db = TicketDatabase(db_path or config.DEFAULT_DATABASE_PATH)
-    db.initialize()
-    ingestor = ParkingTicketIngestor(db, app_token=app_token)
-    return ingestor.ingest(
-        issue_date_from=issue_date_from,
-        issue_date_to=issue_date_to,
-        page_size=page_size,
-        dry_run=dry_run,
-        snapshot_path=snapshot_path,
-        sleep_seconds=sleep_seconds,
-    )
+    with TicketDatabase(db_path or config.DEFAULT_DATABASE_PATH) as db:
+        db.initialize()
+        ingestor = ParkingTicketIngestor(db, app_token=app_token)
+        return ingestor.ingest(
+            issue_date_from=issue_date_from,
+            issue_date_to=issue_date_to,
+            page_size=page_size,
+            dry_run=dry_run,
+            snapshot_path=snapshot_path,
+            sleep_seconds=sleep_seconds,
+            shard_by_borough=shard_by_borough,
+        )
 
 
 __all__ = ["ParkingTicketIngestor", "IngestionStats", "run_ingestion"]
@@ -1,17 +1,24 @@
 """Persistence utilities for parking ticket data."""
 from __future__ import annotations
 
-import json
 import logging
+import operator
 import sqlite3
 from pathlib import Path
-from typing import Iterable, List, Mapping
+from typing import Iterable, List, Mapping, Sequence
 
 from . import config
 
 logger = logging.getLogger(__name__)
 
 
+# Row extraction for executemany runs in C: merging a record over the None
+# defaults fills missing API fields, and the itemgetter pulls all RAW_FIELDS
+# out as a tuple in one call instead of 37 per-row .get() lookups.
+_NONE_DEFAULTS = dict.fromkeys(config.RAW_FIELDS, None)
+_ROW_GETTER = operator.itemgetter(*config.RAW_FIELDS)
+
+
 CREATE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS raw_tickets (
     summons_number TEXT PRIMARY KEY,
@@ -50,8 +57,7 @@ CREATE TABLE IF NOT EXISTS raw_tickets (
     summons_image TEXT,
     violation_code TEXT,
     time_first_observed TEXT,
-    ticket_type TEXT,
-    raw_payload TEXT NOT NULL
+    ticket_type TEXT
 );
 """
 
@@ -62,38 +68,79 @@ class TicketDatabase:
     def __init__(self, path: Path | str = config.DEFAULT_DATABASE_PATH) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: sqlite3.Connection | None = None
 
     def connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.path))
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA synchronous=NORMAL;")
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Return the shared connection, opening it on first use."""
+        if self._conn is None:
+            # check_same_thread is off so the ingestion writer thread can use a
+            # connection opened (for initialize()) on the main thread; access is
+            # never concurrent, only handed off.
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            # page_size only takes effect before the first page is written; it is
+            # a harmless no-op on an existing database.
+            conn.execute("PRAGMA page_size=8192;")
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.execute("PRAGMA cache_size=-262144;")  # 256 MiB of page cache
+            conn.execute("PRAGMA temp_store=MEMORY;")
+            conn.execute("PRAGMA mmap_size=30000000000;")
+            conn.execute("PRAGMA wal_autocheckpoint=10000;")
+            conn.row_factory = sqlite3.Row
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "TicketDatabase":
+        self.connect()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def initialize(self) -> None:
-        with self.connect() as conn:
-            conn.execute(CREATE_TABLE_SQL)
-            conn.commit()
-
-    def upsert_records(self, records: Iterable[Mapping[str, object]]) -> int:
+        conn = self.connect()
+        conn.execute(CREATE_TABLE_SQL)
+        # Databases created before raw_payload was dropped still carry the
+        # NOT NULL column, which would reject every column-less insert.
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(raw_tickets)")}
+        if "raw_payload" in columns:
+            logger.info("Dropping legacy raw_payload column from raw_tickets")
+            conn.execute("ALTER TABLE raw_tickets DROP COLUMN raw_payload")
+        conn.commit()
+
+    def upsert_records(self, records: Sequence[Mapping[str, object]]) -> int:
         if not records:
             return 0
 
         columns = list(config.RAW_FIELDS)
-        placeholders = ", ".join(["?"] * (len(columns) + 1))
-        sql = f"INSERT OR REPLACE INTO raw_tickets ({', '.join(columns)}, raw_payload) VALUES ({placeholders})"
-
-        to_insert: List[List[object]] = []
-        for record in records:
-            row: List[object] = [record.get(field) for field in config.RAW_FIELDS]
-            row.append(json.dumps(record))
-            to_insert.append(row)
-
-        with self.connect() as conn:
-            conn.executemany(sql, to_insert)
+        placeholders = ", ".join(["?"] * len(columns))
+        # Records are immutable once written, so conflicts on the primary key
+        # are skipped outright instead of delete-and-reinserting the full row
+        # (which rewrites every index and maximizes WAL traffic).
+        sql = (
+            f"INSERT INTO raw_tickets ({', '.join(columns)}) VALUES ({placeholders}) "
+            "ON CONFLICT(summons_number) DO NOTHING"
+        )
+
+        rows = (_ROW_GETTER({**_NONE_DEFAULTS, **record}) for record in records)
+
+        conn = self.connect()
+        changes_before = conn.total_changes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(sql, rows)
             conn.commit()
-        logger.debug("Inserted %s records", len(to_insert))
-        return len(to_insert)
+        except Exception:
+            conn.rollback()
+            raise
+        inserted = conn.total_changes - changes_before
+        logger.debug("Inserted %s records (%s already present)", inserted, len(records) - inserted)
+        return inserted
 
     def stream_raw_records(self, limit: int | None = None) -> Iterable[sqlite3.Row]:
         query = "SELECT * FROM raw_tickets"
@@ -102,9 +149,8 @@ class TicketDatabase:
             query += " LIMIT ?"
             params.append(limit)
 
-        with self.connect() as conn:
-            cursor = conn.execute(query, params)
-            yield from cursor
+        cursor = self.connect().execute(query, params)
+        yield from cursor
 
 
 __all__ = ["TicketDatabase"]
@@ -2,13 +2,20 @@
 from __future__ import annotations
 
 import logging
-import sqlite3
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator
 
+import adbc_driver_sqlite.dbapi as adbc_sqlite
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    njit = prange = None
 
 from . import config
 
@@ -23,97 +30,329 @@ class AggregationResult:
 
 
 
-def _parse_datetime(issue_date: str | None, violation_time: str | None) -> Optional[datetime]:
-    if not issue_date:
-        return None
-
-    try:
-        # Issue date is formatted as YYYY-MM-DD (ISO)
-        date_obj = datetime.strptime(issue_date, "%Y-%m-%d")
-    except ValueError:
-        return None
-
-    time_obj: Optional[datetime] = None
-    if violation_time:
-        violation_time = violation_time.strip()
-        # Remove potential trailing letters (A/P) representing AM/PM if present
-        suffix = violation_time[-1]
-        time_part = violation_time
-        if suffix in {"A", "P"} and len(violation_time) >= 5:
-            am_pm = "AM" if suffix == "A" else "PM"
-            time_part = violation_time[:-1]
-            try:
-                time_obj = datetime.strptime(time_part, "%H%M")
-                hour_24 = time_obj.hour
-                if am_pm == "AM":
-                    hour_24 = 0 if hour_24 == 12 else hour_24
-                elif am_pm == "PM":
-                    hour_24 = hour_24 if hour_24 == 12 else hour_24 + 12
-                time_obj = time_obj.replace(hour=hour_24)
-            except ValueError:
-                time_obj = None
-        else:
-            try:
-                time_obj = datetime.strptime(time_part, "%H%M")
-            except ValueError:
-                time_obj = None
-
-    if time_obj:
-        return date_obj.replace(hour=time_obj.hour, minute=time_obj.minute)
-    return date_obj
-
-
-def build_segment_identifier(row: pd.Series) -> str:
-    components = [
-        (row.get("violation_county") or "").strip().upper(),
-        (row.get("street_name") or "").strip().upper(),
-        (row.get("intersecting_street_1") or "").strip().upper(),
-        (row.get("intersecting_street_2") or "").strip().upper(),
-    ]
-    return " | ".join(components)
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Sakamoto's day-of-week month offsets (index = month - 1).
+_SAKAMOTO = np.array([0, 3, 2, 5, 0, 3, 5, 1, 4, 6, 2, 4], dtype=np.int64)
+
+
+# Days per month for date validation (index = month - 1, February pre-leap).
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+
+def _parse_ticket_batch_rows(
+    date_bytes: np.ndarray,
+    time_bytes: np.ndarray,
+    out_dow: np.ndarray,
+    out_hour: np.ndarray,
+    out_valid: np.ndarray,
+) -> None:
+    """Decode ``YYYY-MM-DD`` / ``HHMM[A|P]`` byte rows into day-of-week codes and hours.
+
+    Downstream only needs the weekday and the hour, so no datetime objects are
+    ever constructed: dates are validated and fed through Sakamoto's algorithm
+    on raw digit bytes, and times fall back to midnight when malformed (same
+    behavior as the previous parser). Rows with an invalid date are flagged in
+    ``out_valid`` for the caller to drop. Weekday codes are 0 = Monday.
+    """
+    for i in prange(date_bytes.shape[0]):
+        row = date_bytes[i]
+        valid = row[4] == 45 and row[7] == 45  # the two ISO dashes
+        year = 0
+        month = 0
+        day = 0
+        if valid:
+            for j in range(4):
+                c = row[j]
+                if c < 48 or c > 57:
+                    valid = False
+                    break
+                year = year * 10 + (c - 48)
+        if valid:
+            for j in range(5, 7):
+                c = row[j]
+                if c < 48 or c > 57:
+                    valid = False
+                    break
+                month = month * 10 + (c - 48)
+        if valid:
+            for j in range(8, 10):
+                c = row[j]
+                if c < 48 or c > 57:
+                    valid = False
+                    break
+                day = day * 10 + (c - 48)
+        if valid and (month < 1 or month > 12):
+            valid = False
+        if valid:
+            days_in_month = 31
+            if month == 2:
+                leap = (year % 4 == 0 and year % 100 != 0) or year % 400 == 0
+                days_in_month = 29 if leap else 28
+            elif month == 4 or month == 6 or month == 9 or month == 11:
+                days_in_month = 30
+            if day < 1 or day > days_in_month:
+                valid = False
+
+        out_valid[i] = valid
+        if not valid:
+            out_dow[i] = 0
+            out_hour[i] = 0
+            continue
+
+        y = year - 1 if month < 3 else year
+        dow_sunday0 = (y + y // 4 - y // 100 + y // 400 + _SAKAMOTO[month - 1] + day) % 7
+        out_dow[i] = (dow_sunday0 + 6) % 7
+
+        trow = time_bytes[i]
+        length = trow.shape[0]
+        while length > 0 and trow[length - 1] == 0:
+            length -= 1
+        suffix = 0
+        if length > 0 and (trow[length - 1] == 65 or trow[length - 1] == 80):  # 'A' / 'P'
+            suffix = trow[length - 1]
+            length -= 1
+        value = 0
+        time_ok = length > 0
+        for j in range(length):
+            c = trow[j]
+            if c < 48 or c > 57:
+                time_ok = False
+                break
+            value = value * 10 + (c - 48)
+        hour = 0
+        if time_ok:
+            hour = value // 100
+            minute = value % 100
+            if suffix == 80:  # PM
+                hour = 12 if hour == 12 else hour + 12
+            elif suffix == 65 and hour == 12:  # 12xxAM is midnight
+                hour = 0
+            if hour > 23 or minute > 59:
+                hour = 0
+        out_hour[i] = hour
+
+
+def _parse_ticket_batch_numpy(
+    date_bytes: np.ndarray,
+    time_bytes: np.ndarray,
+    out_dow: np.ndarray,
+    out_hour: np.ndarray,
+    out_valid: np.ndarray,
+) -> None:
+    """Fallback for :func:`_parse_ticket_batch_rows` when numba is unavailable.
+
+    Identical byte arithmetic, expressed as whole-array NumPy operations
+    (one pass per fixed column) instead of a parallel row loop.
+    """
+    digits = date_bytes.astype(np.int64) - 48
+    is_digit = (date_bytes >= 48) & (date_bytes <= 57)
+
+    valid = (date_bytes[:, 4] == 45) & (date_bytes[:, 7] == 45)
+    valid &= is_digit[:, :4].all(axis=1) & is_digit[:, 5:7].all(axis=1) & is_digit[:, 8:].all(axis=1)
+
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+
+    valid &= (month >= 1) & (month <= 12)
+    month_safe = np.clip(month, 1, 12)
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    days_in_month = np.where((month_safe == 2) & leap, 29, _DAYS_IN_MONTH[month_safe - 1])
+    valid &= (day >= 1) & (day <= days_in_month)
+
+    y = np.where(month_safe < 3, year - 1, year)
+    dow_sunday0 = (y + y // 4 - y // 100 + y // 400 + _SAKAMOTO[month_safe - 1] + day) % 7
+    out_dow[:] = np.where(valid, (dow_sunday0 + 6) % 7, 0)
+    out_valid[:] = valid
+
+    # Time decode: trim trailing NULs, peel an optional A/P suffix, then fold
+    # the remaining digit columns into an HHMM integer.
+    nonzero = time_bytes != 0
+    lengths = np.where(nonzero, np.arange(1, time_bytes.shape[1] + 1), 0).max(axis=1)
+    row_index = np.arange(time_bytes.shape[0])
+    last = np.where(lengths > 0, time_bytes[row_index, np.maximum(lengths - 1, 0)], 0)
+    suffix = np.where((last == 65) | (last == 80), last, 0)
+    digit_lengths = lengths - (suffix != 0)
+
+    value = np.zeros(time_bytes.shape[0], dtype=np.int64)
+    time_ok = digit_lengths > 0
+    time_digits = time_bytes.astype(np.int64) - 48
+    time_is_digit = (time_bytes >= 48) & (time_bytes <= 57)
+    for j in range(time_bytes.shape[1]):
+        in_range = j < digit_lengths
+        time_ok &= ~in_range | time_is_digit[:, j]
+        value = np.where(in_range, value * 10 + time_digits[:, j], value)
+
+    hour = value // 100
+    minute = value % 100
+    hour = np.where(suffix == 80, np.where(hour == 12, 12, hour + 12), hour)
+    hour = np.where((suffix == 65) & (value // 100 == 12), 0, hour)
+    hour = np.where((hour > 23) | (minute > 59), 0, hour)
+    out_hour[:] = np.where(valid & time_ok, hour, 0)
+
+
+if njit is not None:
+    _parse_ticket_batch = njit(parallel=True, cache=True)(_parse_ticket_batch_rows)
+else:
+    _parse_ticket_batch = _parse_ticket_batch_numpy
+
+
+# Columns that make up a street segment identifier, in join order.
+SEGMENT_ID_COLUMNS = (
+    "violation_county",
+    "street_name",
+    "intersecting_street_1",
+    "intersecting_street_2",
+)
+
+
+def build_segment_identifiers(df: pd.DataFrame) -> pd.Series:
+    """Build " | "-joined segment identifiers for every row at once."""
+    parts = [df[column].fillna("").str.strip().str.upper() for column in SEGMENT_ID_COLUMNS]
+    return parts[0].str.cat(parts[1:], sep=" | ")
+
+
+# Only the columns the aggregation touches; notably omits the large raw_payload blob.
+AGGREGATION_QUERY = (
+    "SELECT summons_number, issue_date, violation_time, violation_county, street_name, "
+    "intersecting_street_1, intersecting_street_2, ticket_type, latitude, longitude "
+    "FROM raw_tickets"
+)
+
+GROUP_KEYS = ["segment_id", "day_of_week", "hour_of_day", "ticket_type"]
+
+
+def _iter_raw_chunks(db_path: Path) -> Iterator[pd.DataFrame]:
+    """Stream raw_tickets as Arrow record batches, regrouped into transform-sized chunks.
+
+    ADBC hands back the query result as a RecordBatchReader, so rows never pass
+    through Python objects on the way out of SQLite; batches are buffered up to
+    the configured chunk size before conversion for the pandas transform step.
+    """
+    with adbc_sqlite.connect(str(db_path)) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(AGGREGATION_QUERY)
+            reader = cursor.fetch_record_batch()
+            buffer: list[pa.RecordBatch] = []
+            buffered_rows = 0
+            for batch in reader:
+                buffer.append(batch)
+                buffered_rows += batch.num_rows
+                if buffered_rows >= config.AGGREGATION_CHUNK_SIZE:
+                    yield pa.Table.from_batches(buffer).to_pandas()
+                    buffer, buffered_rows = [], 0
+            if buffer:
+                yield pa.Table.from_batches(buffer).to_pandas()
+
+
+def _prepare_tickets(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean a batch of raw ticket rows and derive the grouping columns."""
+    # The REAL column affinity in SQLite means ADBC already hands these back as
+    # float64; only fall back to coercion when a dirty database yields strings.
+    for column in ("latitude", "longitude"):
+        if not pd.api.types.is_float_dtype(df[column]):
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+
+    dates = df["issue_date"].fillna("").to_numpy(dtype="S10").view(np.uint8).reshape(len(df), 10)
+    times = df["violation_time"].fillna("").str.strip().to_numpy(dtype="S5").view(np.uint8).reshape(len(df), 5)
+    day_codes = np.empty(len(df), dtype=np.int8)
+    hours = np.empty(len(df), dtype=np.int8)
+    valid = np.empty(len(df), dtype=np.bool_)
+    _parse_ticket_batch(dates, times, day_codes, hours, valid)
+
+    df = df[valid]
+    df["day_of_week"] = pd.Categorical.from_codes(day_codes[valid], categories=list(DAY_NAMES))
+    df["hour_of_day"] = hours[valid]
+    df["segment_id"] = build_segment_identifiers(df)
+
+    # Filter to rows that have at least a street name and borough
+    df = df[(df["segment_id"].str.strip() != "") & df["street_name"].notna() & df["violation_county"].notna()]
+
+    # Categorical keys make the groupby hash small integer codes instead of
+    # re-hashing the (often long) strings for every row.
+    for column in ("segment_id", "ticket_type", "violation_county"):
+        df[column] = df[column].astype("category")
+    return df
+
+
+def _build_summary_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Collapse the per-(segment, day, hour, type) aggregate to one row per segment."""
+    summary = (
+        df.groupby("segment_id", observed=True)
+        .agg(
+            total_tickets=("ticket_count", "sum"),
+            borough=("violation_county", "first"),
+            street_name=("street_name", "first"),
+            intersecting_street_1=("intersecting_street_1", "first"),
+            intersecting_street_2=("intersecting_street_2", "first"),
+            latitude=("avg_latitude", "mean"),
+            longitude=("avg_longitude", "mean"),
+        )
+        .reset_index()
+    )
+
+    # Distinct ticket types per segment without a per-group Python lambda:
+    # dedupe (segment, type) pairs once, pre-sort by type, then join per group.
+    distinct_types = df[["segment_id", "ticket_type"]].astype({"ticket_type": object}).dropna()
+    distinct_types = distinct_types[distinct_types["ticket_type"] != ""]
+    distinct_types = distinct_types.drop_duplicates().sort_values("ticket_type")
+    joined_types = distinct_types.groupby("segment_id", observed=True)["ticket_type"].agg(", ".join)
+    summary["ticket_types"] = summary["segment_id"].map(joined_types).fillna("Unknown")
+    return summary
 
 
 def aggregate_ticket_counts(
     db_path: Path | str = config.DEFAULT_DATABASE_PATH,
     *,
     output_path: Path | str | None = None,
+    summary_path: Path | str | None = None,
     min_samples_per_segment: int = 5,
 ) -> AggregationResult:
     db_path = Path(db_path)
     output_path = Path(output_path) if output_path else config.DERIVED_DATA_DIR / "segment_time_counts.parquet"
+    summary_path = Path(summary_path) if summary_path else config.DERIVED_DATA_DIR / "segment_summary.parquet"
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with sqlite3.connect(str(db_path)) as conn:
-        query = "SELECT * FROM raw_tickets"
-        df = pd.read_sql_query(query, conn)
-
-    if df.empty:
+    partials: list[pd.DataFrame] = []
+    records_processed = 0
+    for chunk in _iter_raw_chunks(db_path):
+        chunk = _prepare_tickets(chunk)
+        if chunk.empty:
+            continue
+        records_processed += len(chunk)
+        partials.append(
+            chunk.groupby(GROUP_KEYS, dropna=False, observed=True)
+                .agg(
+                    ticket_count=("summons_number", "count"),
+                    sum_latitude=("latitude", "sum"),
+                    n_latitude=("latitude", "count"),
+                    sum_longitude=("longitude", "sum"),
+                    n_longitude=("longitude", "count"),
+                    street_name=("street_name", "first"),
+                    intersecting_street_1=("intersecting_street_1", "first"),
+                    intersecting_street_2=("intersecting_street_2", "first"),
+                    violation_county=("violation_county", "first"),
+                )
+                .reset_index()
+            )
+
+    if not partials:
         logger.warning("No data found in raw_tickets table. Skipping aggregation.")
         return AggregationResult(records_processed=0, records_output=0, output_path=output_path)
 
-    numeric_cols = ["latitude", "longitude", "fine_amount", "amount_due", "penalty_amount", "interest_amount", "reduction_amount", "payment_amount"]
-    for column in numeric_cols:
-        if column in df.columns:
-            df[column] = pd.to_numeric(df[column], errors="coerce")
-
-    df["issue_datetime"] = df.apply(
-        lambda row: _parse_datetime(row.get("issue_date"), row.get("violation_time")), axis=1
-    )
-    df = df.dropna(subset=["issue_datetime"])
-
-    df["day_of_week"] = df["issue_datetime"].dt.day_name()
-    df["hour_of_day"] = df["issue_datetime"].dt.hour
-    df["segment_id"] = df.apply(build_segment_identifier, axis=1)
-
-    # Filter to rows that have at least a street name and borough
-    df = df[(df["segment_id"].str.strip() != "") & df["street_name"].notna() & df["violation_county"].notna()]
-
+    # Merge the per-chunk partial aggregates: counts and coordinate sums add up,
+    # "first" columns keep the first-seen value just like a single-pass groupby.
     grouped = (
-        df.groupby(["segment_id", "day_of_week", "hour_of_day", "ticket_type"], dropna=False)
+        pd.concat(partials, ignore_index=True)
+        .groupby(GROUP_KEYS, dropna=False, observed=True)
         .agg(
-            ticket_count=("summons_number", "count"),
-            avg_latitude=("latitude", "mean"),
-            avg_longitude=("longitude", "mean"),
+            ticket_count=("ticket_count", "sum"),
+            sum_latitude=("sum_latitude", "sum"),
+            n_latitude=("n_latitude", "sum"),
+            sum_longitude=("sum_longitude", "sum"),
+            n_longitude=("n_longitude", "sum"),
             street_name=("street_name", "first"),
             intersecting_street_1=("intersecting_street_1", "first"),
             intersecting_street_2=("intersecting_street_2", "first"),
@@ -121,16 +360,48 @@ def aggregate_ticket_counts(
         )
         .reset_index()
     )
+    grouped["avg_latitude"] = grouped["sum_latitude"] / grouped["n_latitude"]
+    grouped["avg_longitude"] = grouped["sum_longitude"] / grouped["n_longitude"]
+    grouped = grouped.drop(columns=["sum_latitude", "n_latitude", "sum_longitude", "n_longitude"])
+
+    # Concatenating per-chunk categoricals falls back to object dtype, so
+    # re-encode the merged keys once; Arrow then stores them dictionary-encoded.
+    for column in ("segment_id", "day_of_week", "ticket_type", "violation_county"):
+        grouped[column] = grouped[column].astype("category")
 
     grouped = grouped[grouped["ticket_count"] >= max(min_samples_per_segment, 1)]
     grouped = grouped.sort_values(
         by=["ticket_count"], ascending=False
     )
 
-    grouped.to_parquet(output_path, index=False)
+    # Aggregates written before partitioning landed were single files; the
+    # partitioned dataset is a directory of the same name, so clear the old
+    # format out of the way first.
+    if output_path.is_file():
+        logger.info("Removing old single-file aggregate at %s", output_path)
+        output_path.unlink()
+
+    # Partition by borough so downstream readers can prune to the shards they
+    # need; the low-cardinality string columns dictionary-encode very well.
+    pq.write_to_dataset(
+        pa.Table.from_pandas(grouped, preserve_index=False),
+        root_path=output_path,
+        partition_cols=["violation_county"],
+        compression="zstd",
+        use_dictionary=True,
+        write_statistics=True,
+        existing_data_behavior="delete_matching",
+    )
     logger.info("Wrote aggregated dataset to %s (%s rows)", output_path, len(grouped))
+
+    # Derive the per-segment summary from the aggregate while it is still in
+    # memory instead of re-reading the parquet we just wrote.
+    summary = _build_summary_frame(grouped)
+    summary.to_parquet(summary_path, index=False)
+    logger.info("Wrote segment summary to %s (%s rows)", summary_path, len(summary))
+
     return AggregationResult(
-        records_processed=len(df),
+        records_processed=records_processed,
         records_output=len(grouped),
         output_path=output_path,
     )
@@ -145,27 +416,25 @@ def build_segment_summary(
     summary_path = Path(output_path) if output_path else config.DERIVED_DATA_DIR / "segment_summary.parquet"
     summary_path.parent.mkdir(parents=True, exist_ok=True)
 
-    df = pd.read_parquet(aggregated_path)
+    df = pq.read_table(
+        aggregated_path,
+        columns=[
+            "segment_id",
+            "ticket_count",
+            "violation_county",
+            "street_name",
+            "intersecting_street_1",
+            "intersecting_street_2",
+            "avg_latitude",
+            "avg_longitude",
+            "ticket_type",
+        ],
+    ).to_pandas()
     if df.empty:
         logger.warning("Aggregated dataset is empty. Skipping summary build.")
         return AggregationResult(records_processed=0, records_output=0, output_path=summary_path)
 
-    summary = (
-        df.groupby("segment_id")
-        .agg(
-            total_tickets=("ticket_count", "sum"),
-            borough=("violation_county", "first"),
-            street_name=("street_name", "first"),
-            intersecting_street_1=("intersecting_street_1", "first"),
-            intersecting_street_2=("intersecting_street_2", "first"),
-            latitude=("avg_latitude", "mean"),
-            longitude=("avg_longitude", "mean"),
-            ticket_types=("ticket_type", lambda x: sorted(set(filter(None, x)))),
-        )
-        .reset_index()
-    )
-
-    summary["ticket_types"] = summary["ticket_types"].apply(lambda values: ", ".join(values) if values else "Unknown")
+    summary = _build_summary_frame(df)
     summary.to_parquet(summary_path, index=False)
     logger.info("Wrote segment summary to %s (%s rows)", summary_path, len(summary))
     return AggregationResult(
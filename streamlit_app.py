@@ -5,13 +5,155 @@ import os
 from pathlib import Path
 from typing import Optional
 
+import duckdb
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pydeck as pdk
 import streamlit as st
 
 from parking_ticket_map import config
 
 
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# The columns the app actually touches; everything else stays on disk.
+APP_COLUMNS = [
+    "segment_id",
+    "street_name",
+    "intersecting_street_1",
+    "intersecting_street_2",
+    "violation_county",
+    "day_of_week",
+    "hour_of_day",
+    "ticket_type",
+    "ticket_count",
+    "avg_latitude",
+    "avg_longitude",
+]
+
+
+def _dataset_mtime(dataset_path: Path) -> float:
+    """Latest modification time across the dataset (a file or a partitioned directory)."""
+    if dataset_path.is_dir():
+        return max(
+            (part.stat().st_mtime for part in dataset_path.rglob("*.parquet")),
+            default=dataset_path.stat().st_mtime,
+        )
+    return dataset_path.stat().st_mtime
+
+
+def _apply_column_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    # Low-cardinality strings become categoricals so filters compare int8
+    # codes instead of Python strings; the ordered day category also gives
+    # calendar-ordered days for free wherever they are grouped or listed.
+    df["day_of_week"] = pd.Categorical(df["day_of_week"], categories=DAY_ORDER, ordered=True)
+    for column in ("ticket_type", "violation_county", "street_name"):
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    # Narrow numeric dtypes: every mask, groupby, and the payload shipped to
+    # the browser moves a half or a quarter of the bytes. float32 keeps ~1 m
+    # coordinate precision, plenty for a heatmap.
+    df["hour_of_day"] = df["hour_of_day"].astype("uint8")
+    df["ticket_count"] = pd.to_numeric(df["ticket_count"], downcast="unsigned")
+    df[["avg_latitude", "avg_longitude"]] = df[["avg_latitude", "avg_longitude"]].astype("float32")
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _read_aggregated_parquet(dataset_path: str, mtime: float) -> pd.DataFrame:
+    """Read the aggregate once per (path, mtime); reruns serve the cached frame."""
+    return _apply_column_dtypes(pd.read_parquet(dataset_path, columns=APP_COLUMNS))
+
+
+@st.cache_resource(show_spinner=False)
+def _duckdb_connection() -> duckdb.DuckDBPyConnection:
+    """One in-process DuckDB instance; callers take a cursor per query."""
+    return duckdb.connect()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _read_filtered_parquet(
+    dataset_path: str,
+    mtime: float,
+    day: Optional[str],
+    hour_range: tuple[int, int],
+    ticket_type: Optional[str],
+    min_tickets: int,
+) -> pd.DataFrame:
+    """Scan the aggregate with the sidebar predicates pushed into DuckDB.
+
+    DuckDB's vectorized parquet scanner prunes row groups via statistics
+    (and borough partitions via hive paths), filters in C++, and hands the
+    matching rows back as Arrow; only those rows are ever materialized in
+    pandas. Each distinct filter combination is cached.
+    """
+    source = dataset_path
+    if Path(dataset_path).is_dir():
+        source = f"{dataset_path}/**/*.parquet"
+
+    clauses = ["hour_of_day BETWEEN ? AND ?", "ticket_count >= ?"]
+    params: list[object] = [hour_range[0], hour_range[1], min_tickets]
+    if day is not None:
+        clauses.append("day_of_week = ?")
+        params.append(day)
+    if ticket_type is not None:
+        clauses.append("ticket_type = ?")
+        params.append(ticket_type)
+
+    query = (
+        f"SELECT {', '.join(APP_COLUMNS)} "
+        f"FROM read_parquet('{source.replace(chr(39), chr(39) * 2)}', hive_partitioning=true) "
+        f"WHERE {' AND '.join(clauses)}"
+    )
+    table = _duckdb_connection().cursor().execute(query, params).fetch_arrow_table()
+    return _apply_column_dtypes(table.to_pandas())
+
+
+@st.cache_data(show_spinner=False)
+def _metric_cube(dataset_path: str, mtime: float) -> pd.DataFrame:
+    """Tiny (day, ticket type, hour) -> ticket count cube for the peak metrics.
+
+    Built once per dataset version; at most 7 x types x 24 rows, so slicing it
+    per rerun replaces a full-frame groupby with an O(cube) one.
+    """
+    df = _read_aggregated_parquet(dataset_path, mtime)
+    # observed=True keeps absent category combinations out of the cube;
+    # sort=False skips a key sort the bincount consumers never rely on;
+    # dropna=False keeps null ticket types, which ingestion deliberately
+    # retains, so the peaks cover the same tickets as the totals.
+    return (
+        df.groupby(
+            ["day_of_week", "ticket_type", "hour_of_day"], observed=True, sort=False, dropna=False
+        )["ticket_count"]
+        .sum()
+        .reset_index()
+    )
+
+
+def load_metric_cube(path: Optional[str] = None) -> pd.DataFrame:
+    dataset_path = Path(path) if path else config.DERIVED_DATA_DIR / "segment_time_counts.parquet"
+    if not dataset_path.exists():
+        return pd.DataFrame()
+    return _metric_cube(str(dataset_path), _dataset_mtime(dataset_path))
+
+
+def load_filtered_data(
+    path: Optional[str] = None,
+    *,
+    day: Optional[str] = None,
+    hour_range: tuple[int, int],
+    ticket_type: Optional[str] = None,
+    min_tickets: int = 1,
+) -> pd.DataFrame:
+    dataset_path = Path(path) if path else config.DERIVED_DATA_DIR / "segment_time_counts.parquet"
+    if not dataset_path.exists():
+        return pd.DataFrame()
+    return _read_filtered_parquet(
+        str(dataset_path), _dataset_mtime(dataset_path), day, hour_range, ticket_type, min_tickets
+    )
+
+
 def load_aggregated_data(path: Optional[str] = None) -> pd.DataFrame:
     dataset_path = Path(path) if path else config.DERIVED_DATA_DIR / "segment_time_counts.parquet"
     if not dataset_path.exists():
@@ -19,39 +161,215 @@ def load_aggregated_data(path: Optional[str] = None) -> pd.DataFrame:
             "Aggregated dataset not found. Run `python -m parking_ticket_map aggregate` to build it first."
         )
         return pd.DataFrame()
-    return pd.read_parquet(dataset_path)
+    return _read_aggregated_parquet(str(dataset_path), _dataset_mtime(dataset_path))
+
+
+@st.cache_data(show_spinner=False)
+def _dataset_meta(dataset_path: str, mtime: float) -> dict:
+    """Sidebar option metadata, computed once per dataset version."""
+    df = _read_aggregated_parquet(dataset_path, mtime)
+    if df.empty:
+        return {"days": [], "ticket_types": [], "hour_min": 0, "hour_max": 23, "empty": True}
+    return {
+        "days": df["day_of_week"].dropna().unique().sort_values().tolist(),
+        "ticket_types": [t for t in df["ticket_type"].cat.categories if t],
+        "hour_min": int(df["hour_of_day"].min()),
+        "hour_max": int(df["hour_of_day"].max()),
+        "empty": False,
+    }
+
+
+def load_metadata(path: Optional[str] = None) -> Optional[dict]:
+    dataset_path = Path(path) if path else config.DERIVED_DATA_DIR / "segment_time_counts.parquet"
+    if not dataset_path.exists():
+        return None
+    return _dataset_meta(str(dataset_path), _dataset_mtime(dataset_path))
+
+
+# Rough NYC bounding box (lon_min, lat_min, lon_max, lat_max); bad geocodes
+# outside it are culled before anything is shipped to the browser.
+NYC_BOUNDS = (-74.3, 40.45, -73.65, 40.95)
+
+# Above this many points, snap coordinates to a grid and pre-sum weights;
+# 3 decimals is ~100 m, below what a 60 px heatmap kernel can resolve.
+HEATMAP_MAX_POINTS = 50_000
+HEATMAP_GRID_DECIMALS = 3
+
+# Cap on rows sent to the Segment Table tab; the table is interactive, so
+# users sort/search client-side within the busiest segments.
+TABLE_ROW_LIMIT = 5_000
+
+# Source column -> display name for the Segment Table tab.
+TABLE_COLUMNS = {
+    "segment_id": "Segment ID",
+    "street_name": "Street",
+    "intersecting_street_1": "From",
+    "intersecting_street_2": "To",
+    "violation_county": "Borough",
+    "day_of_week": "Day",
+    "hour_of_day": "Hour",
+    "ticket_type": "Ticket Type",
+    "ticket_count": "Tickets",
+}
+
+
+def _heatmap_data(filtered: pd.DataFrame) -> dict:
+    """Columnar deck.gl attribute payload for the heatmap.
+
+    One flat float32 array per attribute instead of a JSON object per row:
+    the browser fills typed arrays directly rather than walking thousands of
+    row dicts, and the payload drops the repeated column names. Points
+    outside NYC are dropped, and very large selections are collapsed onto a
+    grid whose cells are visually indistinguishable from the raw points.
+    """
+    lon = filtered["avg_longitude"].to_numpy(dtype=np.float64)
+    lat = filtered["avg_latitude"].to_numpy(dtype=np.float64)
+    weights = filtered["ticket_count"].to_numpy(dtype=np.float64)
+
+    lon_min, lat_min, lon_max, lat_max = NYC_BOUNDS
+    inside = (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+    if not inside.all():
+        lon, lat, weights = lon[inside], lat[inside], weights[inside]
+
+    if lon.size > HEATMAP_MAX_POINTS:
+        scale = 10.0 ** HEATMAP_GRID_DECIMALS
+        cell_x = np.floor((lon - lon_min) * scale).astype(np.int64)
+        cell_y = np.floor((lat - lat_min) * scale).astype(np.int64)
+        cells, inverse = np.unique(cell_x << 32 | cell_y, return_inverse=True)
+        weights = np.bincount(inverse, weights=weights)
+        lon = (cells >> 32).astype(np.float64) / scale + lon_min + 0.5 / scale
+        lat = (cells & 0xFFFFFFFF).astype(np.float64) / scale + lat_min + 0.5 / scale
+
+    positions = np.empty((lon.size, 2), dtype=np.float32)
+    positions[:, 0] = lon
+    positions[:, 1] = lat
+    return {
+        "length": int(lon.size),
+        "attributes": {
+            "getPosition": {"value": positions.ravel().tolist(), "size": 2},
+            "getWeight": {"value": weights.astype(np.float32).tolist(), "size": 1},
+        },
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _view_midpoint(
+    dataset_path: str,
+    mtime: float,
+    day: Optional[str],
+    hour_range: tuple[int, int],
+    ticket_type: Optional[str],
+    min_tickets: int,
+) -> tuple[float, float]:
+    """Centroid of the filtered view, cached per filter signature.
+
+    Only the coordinate sums and count are computed on a cache miss; repeat
+    visits to a selection get the midpoint in O(1) instead of rescanning two
+    columns. Falls back to downtown Manhattan when nothing has coordinates.
+    """
+    filtered = _read_filtered_parquet(
+        dataset_path, mtime, day, hour_range, ticket_type, min_tickets
+    )
+    lat = filtered["avg_latitude"].to_numpy(dtype=np.float64)
+    lon = filtered["avg_longitude"].to_numpy(dtype=np.float64)
+    located = ~np.isnan(lat) & ~np.isnan(lon)
+    count = int(located.sum())
+    if count == 0:
+        return 40.7128, -74.0060
+    return float(lat[located].sum() / count), float(lon[located].sum() / count)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _deck_for_filters(
+    dataset_path: str,
+    mtime: float,
+    day: Optional[str],
+    hour_range: tuple[int, int],
+    ticket_type: Optional[str],
+    min_tickets: int,
+    map_style: Optional[str],
+    use_mapbox: bool,
+) -> pdk.Deck:
+    """Build the deck once per filter signature; toggling tabs or re-applying a
+    recent combination reuses the serialized deck instead of rebuilding it.
+
+    Keyed on the filter parameters and dataset mtime rather than the frame
+    itself, and cached as a resource because Deck objects are not picklable.
+    """
+    filtered = _read_filtered_parquet(
+        dataset_path, mtime, day, hour_range, ticket_type, min_tickets
+    )
+    filtered = filtered.loc[filtered["avg_latitude"].notna() & filtered["avg_longitude"].notna()]
+
+    midpoint_lat, midpoint_lon = _view_midpoint(
+        dataset_path, mtime, day, hour_range, ticket_type, min_tickets
+    )
+
+    heatmap_layer = pdk.Layer(
+        "HeatmapLayer",
+        data=_heatmap_data(filtered),
+        radiusPixels=60,
+        opacity=0.9,
+    )
+
+    layers = []
+    if use_mapbox:
+        layers.append(heatmap_layer)
+    else:
+        tile_layer = pdk.Layer(
+            "TileLayer",
+            data="https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+            min_zoom=0,
+            max_zoom=19,
+            tile_size=256,
+        )
+        layers.extend([tile_layer, heatmap_layer])
+
+    # No tooltip: the columnar attribute payload has no per-row objects for
+    # picking to resolve against, and grid-binned cells don't map back to
+    # individual segments anyway. Per-segment detail lives in the table tab.
+    return pdk.Deck(
+        map_style=map_style,
+        initial_view_state=pdk.ViewState(
+            latitude=float(midpoint_lat),
+            longitude=float(midpoint_lon),
+            zoom=11.2,
+            pitch=40,
+            bearing=20,
+        ),
+        layers=layers,
+    )
+
+
+def build_deck(
+    path: Optional[str] = None,
+    *,
+    day: Optional[str] = None,
+    hour_range: tuple[int, int],
+    ticket_type: Optional[str] = None,
+    min_tickets: int = 1,
+    map_style: Optional[str] = None,
+    use_mapbox: bool = False,
+) -> pdk.Deck:
+    dataset_path = Path(path) if path else config.DERIVED_DATA_DIR / "segment_time_counts.parquet"
+    return _deck_for_filters(
+        str(dataset_path),
+        _dataset_mtime(dataset_path),
+        day,
+        hour_range,
+        ticket_type,
+        min_tickets,
+        map_style,
+        use_mapbox,
+    )
 
 
 def main() -> None:
     st.set_page_config(page_title="NYC Parking Ticket Heatmap", layout="wide")
 
-    st.markdown(
-        """
-        <style>
-        [data-testid="stSidebar"] .block-container {
-            padding-top: 2rem;
-        }
-        .heatmap-header {
-            padding: 0.75rem 1rem;
-            border-radius: 0.75rem;
-            background: linear-gradient(120deg, rgba(24,74,123,0.85), rgba(9,30,66,0.95));
-            color: #f5f7fb;
-        }
-        .heatmap-header h1 {
-            font-size: 2.4rem;
-            margin-bottom: 0.2rem;
-        }
-        .heatmap-header p {
-            margin-bottom: 0;
-            opacity: 0.85;
-        }
-        [data-testid="stMetricValue"] {
-            font-size: 2rem;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    # The stylesheet lives in static/ (served via enableStaticServing), so only
+    # this link tag is re-sent per rerun and the browser caches the CSS itself.
+    st.markdown('<link rel="stylesheet" href="app/static/app.css">', unsafe_allow_html=True)
 
     st.markdown(
         """
@@ -78,42 +396,47 @@ def main() -> None:
             "Using OpenStreetMap tiles. Add MAPBOX_API_KEY or Streamlit secret `mapbox_token` to enable Mapbox basemaps."
         )
 
-    data = load_aggregated_data()
-    if data.empty:
+    # Sidebar options come from cached per-dataset metadata; no full-frame
+    # scans run during a rerun.
+    meta = load_metadata()
+    if meta is None or meta["empty"]:
+        st.warning(
+            "Aggregated dataset not found. Run `python -m parking_ticket_map aggregate` to build it first."
+        )
         st.stop()
 
-    day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    day_lookup = {day: index for index, day in enumerate(day_order)}
-    unique_days = data["day_of_week"].dropna().unique().tolist()
-    unique_days.sort(key=lambda day: day_lookup.get(day, len(day_order)))
-    day_options = ["All"] + unique_days
-    hour_min, hour_max = int(data["hour_of_day"].min()), int(data["hour_of_day"].max())
+    day_options = ["All"] + meta["days"]
+    hour_min, hour_max = meta["hour_min"], meta["hour_max"]
 
     with st.sidebar:
         st.header("Filters")
         st.caption("Refine the dataset before exploring the map.")
-        day_selected = st.selectbox("Day of Week", options=day_options, index=0)
-        hour_range = st.slider(
-            "Hour of Day", min_value=hour_min, max_value=hour_max, value=(hour_min, hour_max)
-        )
-        ticket_types = ["All"] + sorted(filter(None, data["ticket_type"].dropna().unique().tolist()))
-        ticket_type_selected = st.selectbox("Ticket Type", options=ticket_types, index=0)
-        min_tickets = st.slider(
-            "Minimum tickets per segment", min_value=1, max_value=500, value=10, help="Hide rarely-used segments"
-        )
+        # The form batches widget changes: dragging a slider no longer reruns
+        # the whole pipeline per tick, only pressing Apply does.
+        with st.form("filters", border=False):
+            day_selected = st.selectbox("Day of Week", options=day_options, index=0)
+            hour_range = st.slider(
+                "Hour of Day", min_value=hour_min, max_value=hour_max, value=(hour_min, hour_max)
+            )
+            ticket_types = ["All"] + meta["ticket_types"]
+            ticket_type_selected = st.selectbox("Ticket Type", options=ticket_types, index=0)
+            min_tickets = st.slider(
+                "Minimum tickets per segment", min_value=1, max_value=500, value=10, help="Hide rarely-used segments"
+            )
+            st.form_submit_button("Apply filters", use_container_width=True)
         st.divider()
         st.caption(
             "Ticket counts are aggregated by street segment, day of week, hour of day, and ticket type."
         )
 
-    filtered = data.copy()
-    if day_selected != "All":
-        filtered = filtered[filtered["day_of_week"] == day_selected]
-    filtered = filtered[(filtered["hour_of_day"] >= hour_range[0]) & (filtered["hour_of_day"] <= hour_range[1])]
-    if ticket_type_selected != "All":
-        filtered = filtered[filtered["ticket_type"] == ticket_type_selected]
-    filtered = filtered[filtered["ticket_count"] >= min_tickets]
-    filtered = filtered.dropna(subset=["avg_latitude", "avg_longitude"])
+    filtered = load_filtered_data(
+        day=None if day_selected == "All" else day_selected,
+        hour_range=hour_range,
+        ticket_type=None if ticket_type_selected == "All" else ticket_type_selected,
+        min_tickets=min_tickets,
+    )
+    # Only rows with coordinates are mappable; one fused mask, one slice.
+    filtered = filtered.loc[filtered["avg_latitude"].notna() & filtered["avg_longitude"].notna()]
 
     if filtered.empty:
         st.warning("No data matches the selected filters.")
@@ -121,12 +444,26 @@ def main() -> None:
 
     total_tickets = int(filtered["ticket_count"].sum())
     segment_count = int(filtered["segment_id"].nunique())
-    peak_hour = (
-        filtered.groupby("hour_of_day")["ticket_count"].sum().idxmax() if not filtered.empty else None
-    )
-    peak_day = (
-        filtered.groupby("day_of_week")["ticket_count"].sum().idxmax() if not filtered.empty else None
+
+    # Peak metrics come from the precomputed cube instead of re-grouping the
+    # filtered frame; they reflect the day/hour/type selection (not the
+    # per-segment minimum-ticket display threshold).
+    cube = load_metric_cube()
+    cube_mask = cube["hour_of_day"].between(hour_range[0], hour_range[1])
+    if day_selected != "All":
+        cube_mask &= cube["day_of_week"] == day_selected
+    if ticket_type_selected != "All":
+        cube_mask &= cube["ticket_type"] == ticket_type_selected
+    cube = cube.loc[cube_mask]
+    # Hours and day codes are small dense ints, so bincount replaces the
+    # hash-based groupbys with two tight C loops over the cube.
+    counts = cube["ticket_count"].to_numpy(dtype=np.float64)
+    hour_totals = np.bincount(cube["hour_of_day"].to_numpy(), weights=counts, minlength=24)
+    day_totals = np.bincount(
+        cube["day_of_week"].cat.codes.to_numpy(), weights=counts, minlength=len(DAY_ORDER)
     )
+    peak_hour = int(hour_totals.argmax()) if hour_totals.any() else None
+    peak_day = DAY_ORDER[int(day_totals.argmax())] if day_totals.any() else None
 
     st.markdown("### Filtered Snapshot")
     metric_cols = st.columns(4)
@@ -145,64 +482,26 @@ def main() -> None:
         else:
             st.metric("Busiest hour", "–")
 
-    top_segments = (
-        filtered.sort_values("ticket_count", ascending=False)
-        .head(3)
-        .loc[:, ["street_name", "ticket_count", "violation_county"]]
-    )
+    # nlargest selects the top rows in O(N) instead of fully sorting.
+    top_segments = filtered.nlargest(3, "ticket_count")[
+        ["street_name", "ticket_count", "violation_county"]
+    ]
     if not top_segments.empty:
-        segments_text = []
-        for row in top_segments.itertuples():
-            street = row.street_name if isinstance(row.street_name, str) else "Unknown"
-            borough = row.violation_county if isinstance(row.violation_county, str) else "NYC"
-            segments_text.append(
-                f"{street.title()} ({borough} • {int(row.ticket_count):,} tickets)"
-            )
+        streets = top_segments["street_name"].astype(object).fillna("Unknown").str.title()
+        boroughs = top_segments["violation_county"].astype(object).fillna("NYC")
+        counts = top_segments["ticket_count"].map("{:,}".format)
+        segments_text = (streets + " (" + boroughs + " • " + counts + " tickets)").tolist()
         st.markdown("**Top street segments:** " + ", ".join(segments_text))
 
     st.divider()
 
-    midpoint_lat = filtered["avg_latitude"].mean()
-    midpoint_lon = filtered["avg_longitude"].mean()
-    if pd.isna(midpoint_lat) or pd.isna(midpoint_lon):
-        midpoint_lat, midpoint_lon = 40.7128, -74.0060
-
-    heatmap_layer = pdk.Layer(
-        "HeatmapLayer",
-        data=filtered,
-        get_position="[avg_longitude, avg_latitude]",
-        get_weight="ticket_count",
-        radiusPixels=60,
-        opacity=0.9,
-    )
-
-    layers = []
-    if mapbox_token:
-        layers.append(heatmap_layer)
-    else:
-        tile_layer = pdk.Layer(
-            "TileLayer",
-            data="https://tile.openstreetmap.org/{z}/{x}/{y}.png",
-            min_zoom=0,
-            max_zoom=19,
-            tile_size=256,
-        )
-        layers.extend([tile_layer, heatmap_layer])
-
-    deck = pdk.Deck(
+    deck = build_deck(
+        day=None if day_selected == "All" else day_selected,
+        hour_range=hour_range,
+        ticket_type=None if ticket_type_selected == "All" else ticket_type_selected,
+        min_tickets=min_tickets,
         map_style=map_style,
-        initial_view_state=pdk.ViewState(
-            latitude=float(midpoint_lat),
-            longitude=float(midpoint_lon),
-            zoom=11.2,
-            pitch=40,
-            bearing=20,
-        ),
-        layers=layers,
-        tooltip={
-            "html": "<b>{street_name}</b><br />{ticket_count} tickets<br />{day_of_week} @ {hour_of_day}:00",
-            "style": {"backgroundColor": "rgba(15,23,42,0.85)", "color": "white", "fontSize": "14px"},
-        },
+        use_mapbox=bool(mapbox_token),
     )
 
     map_tab, table_tab = st.tabs(["Interactive Map", "Segment Table"])
@@ -214,37 +513,17 @@ def main() -> None:
         )
 
     with table_tab:
+        # Arrow table built column-by-column: no subset copy, no rename copy,
+        # and categoricals stay dictionary-encoded on the way to the browser.
+        top_rows = filtered.nlargest(TABLE_ROW_LIMIT, "ticket_count")
         st.dataframe(
-            filtered[
-                [
-                    "segment_id",
-                    "street_name",
-                    "intersecting_street_1",
-                    "intersecting_street_2",
-                    "violation_county",
-                    "day_of_week",
-                    "hour_of_day",
-                    "ticket_type",
-                    "ticket_count",
-                ]
-            ]
-            .sort_values("ticket_count", ascending=False)
-            .rename(
-                columns={
-                    "segment_id": "Segment ID",
-                    "street_name": "Street",
-                    "intersecting_street_1": "From",
-                    "intersecting_street_2": "To",
-                    "violation_county": "Borough",
-                    "day_of_week": "Day",
-                    "hour_of_day": "Hour",
-                    "ticket_type": "Ticket Type",
-                    "ticket_count": "Tickets",
-                }
-            ),
+            pa.table({display: pa.array(top_rows[source]) for source, display in TABLE_COLUMNS.items()}),
             use_container_width=True,
         )
-        st.caption("Sort columns to identify notable street segments and ticket types.")
+        st.caption(
+            f"Showing the top {TABLE_ROW_LIMIT:,} rows by ticket count. "
+            "Sort columns to identify notable street segments and ticket types."
+        )
 
     st.divider()
     with st.expander("How this dataset is built"):